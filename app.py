@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session, make_response
+from flask import Flask, render_template, request, jsonify, redirect, url_for, session, make_response, send_from_directory, abort
 import requests
 import logging
 import json
@@ -11,6 +11,9 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.units import inch
 import io
+import mimetypes
+from werkzeug.security import safe_join
+import assets
 app = Flask(__name__)
 app.secret_key = os.urandom(24)  # Required for session
 app.permanent_session_lifetime = timedelta(hours=1)  # Session expires after 1 hour
@@ -89,6 +92,46 @@ DOMAIN_TIPS = {
 DEFAULT_DOMAIN = "Python"
 DEFAULT_LEVEL = "intermediate"
 
+# Bundle filenames change with their content, so they can be cached forever
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def asset_urls(page, kind):
+    """Return the stylesheet or script URLs a page should load, in order."""
+    # Debug mode always uses the sources so CSS/JS edits show up without a rebuild
+    bundle = None if app.debug else assets.load_manifest().get(f"{page}.{kind}")
+    if bundle:
+        return [url_for("built_asset", filename=bundle)]
+    # Not built yet: fall back to the individual source files
+    return [url_for("static", filename=name) for name in assets.BUNDLES[page][kind]]
+
+@app.context_processor
+def inject_asset_helpers():
+    return {"asset_urls": asset_urls}
+
+@app.route("/assets/<path:filename>")
+def built_asset(filename):
+    # Only fingerprinted bundles live here; anything else (e.g. manifest.json) must not get the immutable header
+    match = assets.FINGERPRINTED_NAME.fullmatch(filename)
+    if safe_join(assets.DIST_DIR, filename) is None or not match:
+        abort(404)
+    # Serve a precompressed variant when the client accepts it
+    encoding = None
+    for candidate, suffix in assets.COMPRESSED_SUFFIXES.items():
+        if request.accept_encodings[candidate] and os.path.isfile(os.path.join(assets.DIST_DIR, filename + suffix)):
+            encoding = candidate
+            break
+    response = send_from_directory(assets.DIST_DIR, filename + assets.COMPRESSED_SUFFIXES.get(encoding, ""),
+                                   mimetype=mimetypes.guess_type(filename)[0], download_name=filename,
+                                   etag=False, conditional=False)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    # The content digest gives an ETag that survives rebuilds and matches across hosts
+    response.set_etag(f"{match.group('digest')}-{encoding or 'identity'}")
+    response.headers["Cache-Control"] = ASSET_CACHE_CONTROL
+    response.headers["Vary"] = "Accept-Encoding"
+    response.make_conditional(request)
+    return response
+
 @app.route("/")
 def index():
     return render_template("index.html")
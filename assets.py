@@ -0,0 +1,386 @@
+"""Static asset pipeline.
+
+Bundles and minifies the stylesheets and scripts used by each page, writes
+content-hashed copies (plus precompressed gzip/brotli variants) to
+``dist`` and records them in ``dist/manifest.json``. The app serves them
+from ``/assets/``; ``dist`` sits outside ``static`` so Flask's static
+route cannot serve them without the long-lived cache headers.
+
+Run ``python assets.py`` after editing anything under ``static/css`` or
+``static/js``. The bundles from the last few builds are kept (``--keep N``,
+default 3) so pages that still reference them keep working; older ones are
+pruned. The templates use the individual source files when no
+manifest exists or the app runs in debug mode, so development works
+without a build.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+try:
+    import brotli  # Listed in requirements.txt; without it only .gz variants are built
+except ImportError:
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+DIST_DIR = os.path.join(BASE_DIR, "dist")
+MANIFEST_PATH = os.path.join(DIST_DIR, "manifest.json")
+
+# Source files for each page bundle, in load order (paths relative to static/)
+BASE_CSS = ["css/style.css", "css/style_additional.css", "css/modern.css", "css/enhanced.css"]
+BUNDLES = {
+    "index": {
+        "css": BASE_CSS,
+        "js": ["js/theme.js", "js/enhanced.js"],
+    },
+    "interview": {
+        "css": BASE_CSS,
+        "js": ["js/theme.js", "js/interview.js", "js/enhanced.js"],
+    },
+    "technical_interview": {
+        "css": BASE_CSS,
+        "js": ["js/theme.js", "js/technical_interview.js", "js/enhanced.js"],
+    },
+    "coding_interview": {
+        "css": ["css/style.css", "css/style_additional.css"],
+        "js": ["js/coding_interview.js"],
+    },
+}
+
+# Bundles are named "<page>.<digest>.<kind>", e.g. "index.248e64d8dcce.css"
+DIGEST_LENGTH = 12
+FINGERPRINTED_NAME = re.compile(r"[\w-]+\.(?P<digest>[0-9a-f]{%d})\.(?:css|js)" % DIGEST_LENGTH)
+
+# Builds whose bundles stay on disk for pages and processes still using them
+KEEP_BUILDS = 3
+
+# Precompressed variants written next to every bundle, in order of preference
+COMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+# Comments and quoted strings; strings are kept verbatim, comments dropped
+CSS_COMMENT_OR_STRING = re.compile(r"""(/\*.*?\*/|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""", re.S)
+
+
+def _compact_css(code):
+    code = re.sub(r"\s+", " ", code)
+    # Spaces before ':' are kept since they are significant in selectors (".a :hover")
+    code = re.sub(r" ?([{};,>]) ?", r"\1", code)
+    code = re.sub(r": ", ":", code)
+    return code.replace(";}", "}")
+
+
+def minify_css(source):
+    parts = []
+    code = []
+    for piece in CSS_COMMENT_OR_STRING.split(source):
+        if piece.startswith("/*"):
+            code.append(" ")
+        elif piece.startswith(("'", '"')):
+            parts.extend([_compact_css("".join(code)), piece])
+            code = []
+        else:
+            code.append(piece)
+    parts.append(_compact_css("".join(code)))
+    return "".join(parts).strip()
+
+
+# Keywords after which an expression, and therefore a regex literal, may start
+JS_EXPRESSION_KEYWORDS = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void",
+    "throw", "case", "do", "else", "yield", "await",
+}
+# Keywords whose parenthesised clause is followed by a statement, not an operator
+JS_CONTROL_KEYWORDS = {"if", "while", "for", "with"}
+JS_WORD = re.compile(r"[\w$]+")
+# A line break after the first set or before the second can never matter for
+# automatic semicolon insertion
+JS_OPEN_TOKENS = {"{", "(", "[", ";", ","}
+JS_CLOSE_TOKENS = {"}", ")", "]"}
+
+
+def _skip_js_literal(source, i):
+    """Return the index just past the string or template literal starting at i."""
+    quote = source[i]
+    i += 1
+    while i < len(source):
+        ch = source[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == quote:
+            return i + 1
+        if quote == "`" and source.startswith("${", i):
+            # Template substitution: skip balanced braces, nested literals included
+            i += 2
+            depth = 1
+            while i < len(source) and depth:
+                ch = source[i]
+                if ch in "\"'`":
+                    i = _skip_js_literal(source, i)
+                    continue
+                if ch == "{":
+                    depth += 1
+                elif ch == "}":
+                    depth -= 1
+                i += 1
+            continue
+        i += 1
+    return i
+
+
+def _skip_js_regex(source, i):
+    """Return the index just past the regex literal starting at i (flags included)."""
+    i += 1
+    in_class = False
+    while i < len(source):
+        ch = source[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "[":
+            in_class = True
+        elif ch == "]":
+            in_class = False
+        elif ch == "/" and not in_class:
+            i += 1
+            break
+        i += 1
+    while i < len(source) and (source[i].isalnum() or source[i] == "_"):
+        i += 1
+    return i
+
+
+def js_tokens(source):
+    """Split JavaScript into ``(kind, text)`` tokens.
+
+    ``kind`` is "space" for whitespace and comments, "literal" for string,
+    template and regex literals and "code" for everything else. Whether a
+    '/' starts a regex is decided from the previous token, as in the
+    language grammar.
+    """
+    regex_allowed = True
+    previous = ""
+    parens = []  # For each open '(': does it belong to if/while/for/with?
+    i = 0
+    while i < len(source):
+        ch = source[i]
+        if ch.isspace():
+            end = i + 1
+            while end < len(source) and source[end].isspace():
+                end += 1
+            yield "space", source[i:end]
+            i = end
+            continue
+        if source.startswith("//", i):
+            end = source.find("\n", i)
+            i = len(source) if end == -1 else end
+            yield "space", " "
+            continue
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            end = len(source) if end == -1 else end + 2
+            # A comment spanning lines still counts as a line break for ASI
+            yield "space", "\n" if "\n" in source[i:end] else " "
+            i = end
+            continue
+
+        kind = "code"
+        word = JS_WORD.match(source, i)
+        if ch in "\"'`":
+            kind, end = "literal", _skip_js_literal(source, i)
+            regex_allowed = False
+        elif ch == "/" and regex_allowed:
+            kind, end = "literal", _skip_js_regex(source, i)
+            regex_allowed = False
+        elif word:
+            end = word.end()
+            # After '.' a keyword is just a property name ("x.return / 2")
+            regex_allowed = previous != "." and word.group() in JS_EXPRESSION_KEYWORDS
+        elif source.startswith(("++", "--"), i):
+            end = i + 2
+            regex_allowed = False
+        else:
+            end = i + 1
+            if ch == "(":
+                parens.append(previous in JS_CONTROL_KEYWORDS)
+                regex_allowed = True
+            elif ch == ")":
+                regex_allowed = parens.pop() if parens else False
+            else:
+                regex_allowed = ch != "]"
+        previous = source[i:end]
+        yield kind, previous
+        i = end
+
+
+def _js_separator(previous, token, gap):
+    """Return the shortest whitespace that keeps two tokens apart."""
+    if "\n" in gap and previous not in JS_OPEN_TOKENS and token not in JS_CLOSE_TOKENS:
+        return "\n"
+    first, last = token[0], previous[-1]
+    if JS_WORD.match(last) and JS_WORD.match(first):
+        return " "
+    # "a + +b", "a - --b", "x / /re/", and "1 .toString()" would otherwise change meaning
+    if last + first in ("++", "--", "//", "/*") or (previous.isdigit() and first == "."):
+        return " "
+    return ""
+
+
+def minify_js(source):
+    """Strip comments and redundant whitespace from JavaScript.
+
+    Deliberately conservative: string, template and regex literals are kept
+    verbatim and line breaks that could matter for automatic semicolon
+    insertion are preserved.
+    """
+    out = []
+    gap = ""
+    for kind, text in js_tokens(source):
+        if kind == "space":
+            gap += text
+            continue
+        if out and gap:
+            out.append(_js_separator(out[-1], text, gap))
+        out.append(text)
+        gap = ""
+    return "".join(out)
+
+
+def significant_js_tokens(source):
+    return [text for kind, text in js_tokens(source) if kind != "space"]
+
+
+MINIFIERS = {"css": minify_css, "js": minify_js}
+
+
+def bundle_source(kind, files):
+    contents = []
+    for name in files:
+        with open(os.path.join(STATIC_DIR, name), encoding="utf-8") as f:
+            source = f.read()
+        minified = MINIFIERS[kind](source)
+        if kind == "js" and significant_js_tokens(minified) != significant_js_tokens(source):
+            raise ValueError(f"Minifying {name} changed its tokens; refusing to bundle it")
+        contents.append(minified)
+    # Scripts are joined with ';' so one file can never run into the next
+    separator = "\n" if kind == "css" else ";\n"
+    return separator.join(contents) + "\n"
+
+
+def write_atomic(path, data):
+    # Write to a temporary file first so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_bundle(path, data):
+    # Content-hashed files never change, so anything already on disk is reused
+    outputs = {path: lambda: data}
+    # mtime=0 makes the gzip output reproducible for identical input
+    outputs[path + COMPRESSED_SUFFIXES["gzip"]] = lambda: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        outputs[path + COMPRESSED_SUFFIXES["br"]] = lambda: brotli.compress(data, quality=11)
+    for output_path, compress in outputs.items():
+        if os.path.exists(output_path):
+            # Mark the file as used by this build so prune() keeps it
+            os.utime(output_path)
+        else:
+            write_atomic(output_path, compress())
+
+
+def source_files():
+    return sorted({name for kinds in BUNDLES.values() for files in kinds.values() for name in files})
+
+
+def build():
+    """Build every bundle into dist and return the new manifest.
+
+    Bundles from earlier builds are left in place; the manifest is written
+    last so it only ever names files that already exist.
+    """
+    os.makedirs(DIST_DIR, exist_ok=True)
+
+    manifest = {}
+    written = {}  # digest -> filename, so pages with identical bundles share one cached file
+    for page, kinds in BUNDLES.items():
+        for kind, files in kinds.items():
+            data = bundle_source(kind, files).encode("utf-8")
+            digest = hashlib.sha256(data).hexdigest()[:DIGEST_LENGTH]
+            if digest not in written:
+                filename = f"{page}.{digest}.{kind}"
+                write_bundle(os.path.join(DIST_DIR, filename), data)
+                written[digest] = filename
+            manifest[f"{page}.{kind}"] = written[digest]
+
+    write_atomic(MANIFEST_PATH, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+    return manifest
+
+
+def prune(keep=KEEP_BUILDS):
+    """Delete all but the ``keep`` most recently built versions of each bundle.
+
+    Files named in the current manifest are always kept. Returns the names
+    of the removed bundles.
+    """
+    current = set(load_manifest().values())
+    versions = {}  # "index.css" -> ["index.<digest>.css", ...]
+    for name in os.listdir(DIST_DIR):
+        match = FINGERPRINTED_NAME.fullmatch(name)
+        if match:
+            versions.setdefault(name.replace("." + match.group("digest"), "", 1), []).append(name)
+
+    removed = []
+    for names in versions.values():
+        names.sort(key=lambda name: os.path.getmtime(os.path.join(DIST_DIR, name)), reverse=True)
+        for name in names[keep:]:
+            if name in current:
+                continue
+            for suffix in ("",) + tuple(COMPRESSED_SUFFIXES.values()):
+                path = os.path.join(DIST_DIR, name + suffix)
+                if os.path.exists(path):
+                    os.remove(path)
+            removed.append(name)
+    return sorted(removed)
+
+
+# Parsed manifest, re-read whenever the file on disk changes so a running
+# app picks up a new build without a restart
+_manifest_cache = {"key": None, "manifest": {}}
+
+
+def load_manifest():
+    """Return the build manifest, or an empty dict if assets have not been built."""
+    try:
+        key = (MANIFEST_PATH, os.stat(MANIFEST_PATH).st_mtime_ns)
+        if _manifest_cache["key"] != key:
+            with open(MANIFEST_PATH, encoding="utf-8") as f:
+                _manifest_cache["manifest"] = json.load(f)
+            _manifest_cache["key"] = key
+    except (OSError, ValueError):
+        return {}
+    return _manifest_cache["manifest"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the static asset bundles.")
+    parser.add_argument("--keep", type=int, default=KEEP_BUILDS,
+                        help="number of builds of each bundle to keep on disk (default: %(default)s)")
+    args = parser.parse_args()
+    for key, filename in sorted(build().items()):
+        print(f"{key} -> dist/{filename}")
+    for filename in prune(args.keep):
+        print(f"pruned dist/{filename}")
+    if brotli is None:
+        print("brotli is not installed; only gzip variants were written")
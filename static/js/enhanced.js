@@ -22,20 +22,6 @@ document.addEventListener("DOMContentLoaded", function() {
     }, 100);
   });
   
-  // Show loading indicator during API calls
-  const loadingIndicator = document.getElementById('loadingIndicator');
-  if (loadingIndicator) {
-    // For technical interview
-    const originalFetchQuestion = window.fetchNextQuestion;
-    if (typeof originalFetchQuestion === 'function') {
-      window.fetchNextQuestion = async function() {
-        loadingIndicator.style.display = 'block';
-        await originalFetchQuestion();
-        loadingIndicator.style.display = 'none';
-      };
-    }
-  }
-  
   // Add typing animation for chat messages
   const typingIndicator = document.getElementById('typingIndicator');
   if (typingIndicator) {
@@ -0,0 +1,184 @@
+import gzip
+import json
+import os
+import re
+
+import pytest
+
+import app
+import assets
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("var s = 'a  ;  b' + \"c // d\";", "var s='a  ;  b'+\"c // d\";"),
+    ("let s = `a  ${b ? `<i>${c}</i>` : ''}  d`;", "let s=`a  ${b ? `<i>${c}</i>` : ''}  d`;"),
+    ("a = b / c / d", "a=b/c/d"),
+    ("i++ / 2", "i++/2"),
+    ("x.return / 2", "x.return/2"),
+    ("return /x/.test(s)", "return/x/.test(s)"),
+    ("typeof /x/", "typeof/x/"),
+    ("if (x) /a'/.test(y); z='//'", "if(x)/a'/.test(y);z='//'"),
+    ("(a) / (b)", "(a)/(b)"),
+    ("x = /[/]\\//g.source", "x=/[/]\\//g.source"),
+    ("x / /re/.source", "x/ /re/.source"),
+    ("a + +b; c - --d", "a+ +b;c- --d"),
+    ("1 .toString()", "1 .toString()"),
+])
+def test_minify_js_literals_and_operators(source, expected):
+    assert assets.minify_js(source) == expected
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("a = 1\nb = 2", "a=1\nb=2"),
+    ("return\nvalue", "return\nvalue"),
+    ("a\n++b", "a\n++b"),
+    ("f(\n  x,\n  y\n);\nif (a) {\n  b()\n}\nc", "f(x,y);if(a){b()}\nc"),
+    ("x = y /* spans\n lines */ z", "x=y\nz"),
+    ("x = y // trailing\nz", "x=y\nz"),
+])
+def test_minify_js_keeps_asi_relevant_newlines(source, expected):
+    assert assets.minify_js(source) == expected
+
+
+@pytest.mark.parametrize("source, expected", [
+    ('.a::before { content: " ; , { } "; }', '.a::before{content:" ; , { } "}'),
+    (".b { content: '/* not a comment */'; }", ".b{content:'/* not a comment */'}"),
+    ("/* gone */ .c :hover > d , e { color: red; }", ".c :hover>d,e{color:red}"),
+    ("@media (max-width: 768px) {\n  .f { margin: 0 auto; }\n}", "@media (max-width:768px){.f{margin:0 auto}}"),
+])
+def test_minify_css(source, expected):
+    assert assets.minify_css(source) == expected
+
+
+def _sources(kind):
+    return [name for name in assets.source_files() if name.endswith("." + kind)]
+
+
+def _read(name):
+    with open(os.path.join(assets.STATIC_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("name", _sources("js"))
+def test_minify_js_round_trip_on_static_files(name):
+    source = _read(name)
+    minified = assets.minify_js(source)
+    assert assets.significant_js_tokens(minified) == assets.significant_js_tokens(source)
+    assert assets.minify_js(minified) == minified
+
+
+@pytest.mark.parametrize("name", _sources("css"))
+def test_minify_css_round_trip_on_static_files(name):
+    source = _read(name)
+    minified = assets.minify_css(source)
+    strings = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+    assert strings.findall(minified) == strings.findall(re.sub(r"/\*.*?\*/", "", source, flags=re.S))
+    assert assets.minify_css(minified) == minified
+
+
+def test_build_keeps_earlier_bundles(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "DIST_DIR", str(tmp_path))
+    monkeypatch.setattr(assets, "MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    old_bundle = tmp_path / "index.000000000000.css"
+    old_bundle.write_text("old")
+
+    manifest = assets.build()
+
+    assert old_bundle.read_text() == "old"
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+    for filename in manifest.values():
+        assert assets.FINGERPRINTED_NAME.fullmatch(filename)
+        assert (tmp_path / filename).is_file()
+        assert (tmp_path / (filename + ".gz")).is_file()
+
+
+def test_prune_keeps_recent_builds(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "DIST_DIR", str(tmp_path))
+    monkeypatch.setattr(assets, "MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    older, oldest = tmp_path / "index.111111111111.js", tmp_path / "index.000000000000.js"
+    for age, bundle in enumerate([older, oldest], start=1):
+        for path in (bundle, tmp_path / (bundle.name + ".gz")):
+            path.write_text("old")
+            os.utime(path, (1000 - age, 1000 - age))
+
+    manifest = assets.build()
+
+    assert assets.prune(keep=2) == [oldest.name]
+    assert older.is_file() and not oldest.exists()
+    assert not (tmp_path / (oldest.name + ".gz")).exists()
+    assert (tmp_path / manifest["index.js"]).is_file()
+
+
+@pytest.fixture
+def dist(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "DIST_DIR", str(tmp_path))
+    monkeypatch.setattr(assets, "MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(app.app, "debug", False)
+    return tmp_path
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+def _page_assets(client):
+    return re.findall(r'(?:href|src)="(/(?:assets|static)/[^"]+)"', client.get("/").get_data(as_text=True))
+
+
+def test_pages_use_built_bundles(dist, client):
+    manifest = assets.build()
+    assert _page_assets(client) == ["/assets/" + manifest["index.css"], "/assets/" + manifest["index.js"]]
+
+
+def test_pages_fall_back_to_sources_without_manifest(dist, client):
+    assert _page_assets(client) == ["/static/" + name for name in assets.BUNDLES["index"]["css"] + assets.BUNDLES["index"]["js"]]
+
+
+def test_pages_use_sources_in_debug_mode(dist, client, monkeypatch):
+    assets.build()
+    monkeypatch.setattr(app.app, "debug", True)
+    assert all(url.startswith("/static/") for url in _page_assets(client))
+
+
+@pytest.mark.parametrize("accept, encoding", [("gzip, br", "br"), ("gzip", "gzip"), ("", None)])
+def test_built_asset_encoding_and_cache_headers(dist, client, accept, encoding):
+    if encoding == "br":
+        pytest.importorskip("brotli")
+    filename = assets.build()["index.css"]
+    digest = assets.FINGERPRINTED_NAME.fullmatch(filename).group("digest")
+
+    response = client.get("/assets/" + filename, headers={"Accept-Encoding": accept})
+
+    assert response.status_code == 200
+    assert response.headers.get("Content-Encoding") == encoding
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["Cache-Control"] == app.ASSET_CACHE_CONTROL
+    assert response.headers["Content-Type"].startswith("text/css")
+    assert response.get_etag() == (f"{digest}-{encoding or 'identity'}", False)
+    body = response.get_data()
+    if encoding == "br":
+        body = assets.brotli.decompress(body)
+    elif encoding == "gzip":
+        body = gzip.decompress(body)
+    assert body == (dist / filename).read_bytes()
+
+
+def test_built_asset_not_modified(dist, client):
+    filename = assets.build()["index.js"]
+    etag = client.get("/assets/" + filename, headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+
+    response = client.get("/assets/" + filename, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert not response.get_data()
+    # A client that changed encodings must not reuse the gzip body
+    assert client.get("/assets/" + filename, headers={"If-None-Match": etag}).status_code == 200
+
+
+@pytest.mark.parametrize("path", [
+    "manifest.json", "index.css", "index.000000000000.css", "../app.py", "..%2Fapp.py",
+])
+def test_built_asset_rejects_other_files(dist, client, path):
+    assets.build()
+    (dist / "index.css").write_text("not fingerprinted")
+    assert client.get("/assets/" + path).status_code == 404